@@ -1,36 +1,30 @@
 import asyncio
-from mcup.client.stdio import stdio_client
-from mcup.shared.stdio import StdioServerParameters
+from mcup.client.stdio import StdioServerParameters, stdio_client
 
 async def main():
     server_params = StdioServerParameters(command="python3", args=["-m", "examples.servers.fastmcp", "stdio"])
     try:
         async with stdio_client(server_params, approval_mode='cli') as session:
-            # Prompts for approval (mutating tool)
-            try:
-                result = await session.call_tool("write_data", {"data": "example"})
-                print(f"Write result: {result}")
-            except Exception as e:
-                print(f"Error calling write_data: {e}")
-            # No prompt (non-mutating tool)
-            try:
-                result = await session.call_tool("get_data", {"id": "123"})
-                print(f"Get result: {result}")
-            except Exception as e:
-                print(f"Error calling get_data: {e}")
-            # No prompt (non-tool action)
-            try:
-                tools = await session.list_tools()
-                print(f"Tools: {tools}")
-            except Exception as e:
-                print(f"Error listing tools: {e}")
-            try:
-                resource = await session.read_resource("file:///data/readme.txt")
-                print(f"Resource: {resource}")
-            except Exception as e:
-                print(f"Error reading resource: {e}")
+            # Independent requests are issued together; only write_data prompts for approval
+            write_result, get_result, tools, resource = await asyncio.gather(
+                session.call_tool("write_data", {"data": "example"}),  # Prompts for approval (mutating tool)
+                session.call_tool("get_data", {"id": "123"}),  # No prompt (non-mutating tool)
+                session.list_tools(),  # No prompt (non-tool action)
+                session.read_resource("file:///data/readme.txt"),
+                return_exceptions=True,
+            )
+            for label, result in (
+                ("Write result", write_result),
+                ("Get result", get_result),
+                ("Tools", tools),
+                ("Resource", resource),
+            ):
+                if isinstance(result, BaseException):
+                    print(f"Error for {label.lower()}: {result}")
+                else:
+                    print(f"{label}: {result}")
     except Exception as e:
         print(f"Stdio client error: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import anyio
@@ -22,37 +23,27 @@ async def write_data(
     # Simulate writing data (e.g., to a file or store)
     return [types.TextContent(type="text", text=f"Data written: {data}")], {"status": "success", "data": data}
 
-@click.command()
-@click.option("--port", default=8000, help="Port to listen on for SSE")
-@click.option(
-    "--transport",
-    type=click.Choice(["stdio", "sse"]),
-    default="stdio",
-    help="Transport type",
-)
-def main(port: int, transport: str) -> int:
+FetchFnT = Callable[[str], Awaitable[tuple[list[types.ContentBlock], dict[str, Any]]]]
+
+def create_server(fetch: FetchFnT = fetch_website) -> Server:
+    """
+    Build the website-fetcher server with its fetch and write_data tools.
+
+    fetch retrieves a URL for the fetch tool; pass a stub to run the server without network access.
+    """
     app = Server("mcp-website-fetcher")
 
     @app.call_tool()
-    async def fetch_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    async def fetch_tool(name: str, arguments: dict[str, Any]) -> tuple[list[types.ContentBlock], dict[str, Any]]:
+        # Returning (content, structured) keeps the text as content and the dict as structuredContent
         if name == "fetch":
             if "url" not in arguments:
                 raise ValueError("Missing required argument 'url'")
-            content, structured = await fetch_website(arguments["url"])
-            return {
-                "content": [{"type": "text", "text": content[0].text}],
-                "structuredContent": structured,
-                "isMutating": False
-            }
+            return await fetch(arguments["url"])
         elif name == "write_data":
             if "data" not in arguments:
                 raise ValueError("Missing required argument 'data'")
-            content, structured = await write_data(arguments["data"])
-            return {
-                "content": [{"type": "text", "text": content[0].text}],
-                "structuredContent": structured,
-                "isMutating": True
-            }
+            return await write_data(arguments["data"])
         else:
             raise ValueError(f"Unknown tool: {name}")
 
@@ -93,6 +84,19 @@ def main(port: int, transport: str) -> int:
             )
         ]
 
+    return app
+
+@click.command()
+@click.option("--port", default=8000, help="Port to listen on for SSE")
+@click.option(
+    "--transport",
+    type=click.Choice(["stdio", "sse"]),
+    default="stdio",
+    help="Transport type",
+)
+def main(port: int, transport: str) -> int:
+    app = create_server()
+
     if transport == "sse":
         from mcup.server.sse import SseServerTransport
         from starlette.applications import Starlette
@@ -45,34 +45,27 @@ async def run(approval_mode: Optional[str] = None):
                 print(f"Error initializing session: {e}")
                 return
 
-            # List available tools
-            try:
-                tools = await session.list_tools()
-                print(f"Available tools: {[t.name for t in tools.tools]}")
-            except Exception as e:
-                print(f"Error listing tools: {e}")
+            # List tools and call both tools concurrently; write_data (mutating) prompts for approval
+            tools, fetch_result, write_result = await asyncio.gather(
+                session.list_tools(),
+                session.call_tool("fetch", arguments={"url": "https://example.com"}),
+                session.call_tool("write_data", arguments={"data": "example"}),
+                return_exceptions=True,
+            )
 
-            # Call the fetch tool (non-mutating)
-            try:
-                result = await session.call_tool("fetch", arguments={"url": "https://example.com"})
-                result_unstructured = result.content[0]
-                if isinstance(result_unstructured, types.TextContent):
-                    print(f"Tool result (fetch): {result_unstructured.text[:100]}...")  # Truncate for brevity
-                result_structured = result.structuredContent
-                print(f"Structured tool result (fetch): {result_structured}")
-            except Exception as e:
-                print(f"Error calling fetch: {e}")
+            if isinstance(tools, BaseException):
+                print(f"Error listing tools: {tools}")
+            else:
+                print(f"Available tools: {[t.name for t in tools.tools]}")
 
-            # Call the write_data tool (mutating)
-            try:
-                result = await session.call_tool("write_data", arguments={"data": "example"})
+            for tool_name, result in (("fetch", fetch_result), ("write_data", write_result)):
+                if isinstance(result, BaseException):
+                    print(f"Error calling {tool_name}: {result}")
+                    continue
                 result_unstructured = result.content[0]
                 if isinstance(result_unstructured, types.TextContent):
-                    print(f"Tool result (write_data): {result_unstructured.text}")
-                result_structured = result.structuredContent
-                print(f"Structured tool result (write_data): {result_structured}")
-            except Exception as e:
-                print(f"Error calling write_data: {e}")
+                    print(f"Tool result ({tool_name}): {result_unstructured.text[:100]}")  # Truncate for brevity
+                print(f"Structured tool result ({tool_name}): {result.structuredContent}")
     except Exception as e:
         print(f"Stdio client error: {e}")
         import traceback
@@ -1,6 +1,14 @@
+import asyncio
 import logging
-from typing import Any, Optional, Set
-from aioconsole import ainput  # For async CLI input
+import os
+import re
+import sys
+from typing import Any, Optional, Protocol, Set
+
+import anyio
+import anyio.to_thread
+from anyio.lowlevel import RunVar
+from pydantic import BaseModel
 
 from .session import ClientSession, ProgressFnT
 from mcup import types
@@ -8,6 +16,89 @@ from mcup.types import CallToolResult
 
 logger = logging.getLogger("client")
 
+# Result types for the non-tool methods accepted by MCUPSession.batch
+_BATCH_RESULT_TYPES: dict[str, type[BaseModel]] = {
+    "ping": types.EmptyResult,
+    "logging/setLevel": types.EmptyResult,
+    "completion/complete": types.CompleteResult,
+    "prompts/get": types.GetPromptResult,
+    "prompts/list": types.ListPromptsResult,
+    "resources/list": types.ListResourcesResult,
+    "resources/templates/list": types.ListResourceTemplatesResult,
+    "resources/read": types.ReadResourceResult,
+    "resources/subscribe": types.EmptyResult,
+    "resources/unsubscribe": types.EmptyResult,
+    "tools/list": types.ListToolsResult,
+}
+
+# Serializes prompts on each event loop, so concurrent approvals ask and read one at a time
+_stdin_lock: RunVar[anyio.Lock] = RunVar("_stdin_lock")
+
+def _get_stdin_lock() -> anyio.Lock:
+    try:
+        return _stdin_lock.get()
+    except LookupError:
+        lock = anyio.Lock()
+        _stdin_lock.set(lock)
+        return lock
+
+def _watch_line(loop: asyncio.AbstractEventLoop, fd: int) -> asyncio.Future[bytes]:
+    """
+    Start reading one line from fd on the event loop; the caller awaits the future and then removes the reader.
+
+    Each readiness event reads a single byte, so the fd never needs O_NONBLOCK and nothing
+    past the newline is consumed; a later input() sees exactly the bytes that follow.
+    """
+    line_read: asyncio.Future[bytes] = loop.create_future()
+    line = bytearray()
+
+    def on_readable() -> None:
+        if line_read.done():
+            return
+        try:
+            chunk = os.read(fd, 1)
+        except OSError as exc:
+            line_read.set_exception(exc)
+            return
+        line.extend(chunk)
+        if not chunk or chunk == b"\n":
+            line_read.set_result(bytes(line))
+
+    loop.add_reader(fd, on_readable)
+    return line_read
+
+def _stdin_watch_loop() -> asyncio.AbstractEventLoop | None:
+    """Return the asyncio loop to watch stdin on, or None to read it in a thread instead."""
+    # Windows loops can't watch console handles, and piped stdin may already sit in
+    # sys.stdin's buffer (e.g. after an input() call), where the fd watcher can't see it
+    if sys.platform == "win32" or not sys.stdin.isatty():
+        return None
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        # Not running on asyncio, e.g. under trio
+        return None
+
+async def ainput(prompt: str = "") -> str:
+    """Write a prompt and read a line from stdin without blocking the event loop."""
+    async with _get_stdin_lock():
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        loop = _stdin_watch_loop()
+        if loop is None:
+            line = await anyio.to_thread.run_sync(sys.stdin.readline)
+        else:
+            fd = sys.stdin.fileno()
+            line_read = _watch_line(loop, fd)
+            try:
+                line = (await line_read).decode()
+            finally:
+                loop.remove_reader(fd)
+    return line.rstrip("\n")
+
+class ApprovalFnT(Protocol):
+    async def __call__(self, prompt: str) -> str: ...
+
 class MCUPSession(ClientSession):
     def __init__(
         self,
@@ -22,8 +113,14 @@ class MCUPSession(ClientSession):
         client_info=None,
         approval_mode: Optional[str] = None,
         mutating_tool_keywords: Set[str] = {"write", "delete", "update", "create", "modify"},
+        approval_source: ApprovalFnT | None = None,
     ) -> None:
-        """Initialize an MCUP session with optional CLI approval for mutating tool calls."""
+        """
+        Initialize an MCUP session with optional CLI approval for mutating tool calls.
+
+        approval_source is awaited with the prompt text and returns the user's answer; it
+        defaults to reading a line from stdin. Pass a scripted source for tests or CI.
+        """
         super().__init__(
             read_stream,
             write_stream,
@@ -36,7 +133,13 @@ class MCUPSession(ClientSession):
             client_info=client_info or types.Implementation(name="mcup", version="0.1.0"),
         )
         self.approval_mode = approval_mode
-        self._mutating_tool_keywords = mutating_tool_keywords
+        self._approval_source = approval_source or ainput
+        # A single case-insensitive pattern scans the tool name once in C, without
+        # lowercasing it first. "(?!)" never matches, for an empty keyword set.
+        self._mutating_tool_pattern = re.compile(
+            "|".join(map(re.escape, mutating_tool_keywords)) or "(?!)",
+            re.IGNORECASE,
+        )
 
     async def call_tool(
         self,
@@ -46,13 +149,62 @@ class MCUPSession(ClientSession):
         progress_callback: Optional[ProgressFnT] = None,
     ) -> CallToolResult:
         """Send a tools/call request, prompting for approval if the tool is mutating."""
-        is_mutating = any(keyword in name.lower() for keyword in self._mutating_tool_keywords)
+        await self._request_approval(name, arguments)
+        return await super().call_tool(name, arguments, read_timeout_seconds, progress_callback)
+
+    async def batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """
+        Send several requests as one burst and return their results in call order.
+
+        Each call is a (method, params) pair, e.g. ("tools/call", {"name": "fetch", "arguments": {...}}).
+        Approval prompts for mutating tool calls run first, in order, so a denial aborts the
+        batch before anything is sent. The requests are then queued together so the transport
+        can write them in a single pass; responses are matched back to requests by id.
+
+        A failed request doesn't cancel the others: its slot in the returned list holds the
+        exception it raised (e.g. McpError) instead of a result.
+        """
+        for method, params in calls:
+            if method == "tools/call":
+                if "name" not in params:
+                    raise ValueError("tools/call in batch is missing the tool name")
+            elif method not in _BATCH_RESULT_TYPES:
+                raise ValueError(f"Unsupported method in batch: {method}")
+        for method, params in calls:
+            if method == "tools/call":
+                await self._request_approval(params["name"], params.get("arguments"))
+
+        results: list[Any] = [None] * len(calls)
+
+        async def send(index: int, method: str, params: dict[str, Any]) -> None:
+            try:
+                if method == "tools/call":
+                    # Already approved above, so skip MCUPSession.call_tool
+                    results[index] = await super(MCUPSession, self).call_tool(params["name"], params.get("arguments"))
+                elif method == "tools/list":
+                    # Goes through list_tools so the output schema cache stays current
+                    results[index] = await self.list_tools(params.get("cursor"))
+                else:
+                    request = types.ClientRequest.model_validate({"method": method, "params": params or None})
+                    results[index] = await self.send_request(request, _BATCH_RESULT_TYPES[method])
+            except Exception as exc:
+                # Kept in place of the result, so one failure neither cancels nor hides the rest
+                results[index] = exc
+
+        async with anyio.create_task_group() as tg:
+            for index, (method, params) in enumerate(calls):
+                tg.start_soon(send, index, method, params)
+        return results
+
+    async def _request_approval(self, name: str, arguments: dict[str, Any] | None) -> None:
+        """Prompt for approval if the tool is mutating, raising ValueError if the user denies it."""
+        is_mutating = self._mutating_tool_pattern.search(name) is not None
         if is_mutating and self.approval_mode == "cli":
             logger.debug(f"Requesting approval for tool call: {name}")
             details = {"tool_name": name, "arguments": arguments or {}}
             prompt = f"Approve MCUP tool call?\nDetails: {details}\n(y/n): "
             try:
-                user_input = await ainput(prompt)
+                user_input = await self._approval_source(prompt)
                 approved = user_input.strip().lower() == 'y'
                 logger.info(f"[tool call] {'Approved' if approved else 'Denied'}: {details}")
                 if not approved:
@@ -60,4 +212,3 @@ class MCUPSession(ClientSession):
             except Exception as e:
                 logger.error(f"Approval error: {e}")
                 raise
-        return await super().call_tool(name, arguments, read_timeout_seconds, progress_callback)
\ No newline at end of file
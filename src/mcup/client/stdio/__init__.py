@@ -1,10 +1,11 @@
-import json
+import codecs
+import functools
 import logging
 import os
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Literal, TextIO, Optional
+from typing import TYPE_CHECKING, Literal, TextIO, Optional
 from collections.abc import AsyncGenerator
 
 import anyio
@@ -15,16 +16,24 @@ from anyio.streams.text import TextReceiveStream
 from pydantic import BaseModel, Field
 
 import mcup.types as types
-from mcup.os.posix.utilities import terminate_posix_process_tree
-from mcup.os.win32.utilities import (
-    FallbackProcess,
-    create_windows_process,
-    get_windows_executable_command,
-    terminate_windows_process_tree,
-)
-from mcup.shared.message import SessionMessage
+from mcup.shared._stream_utils import STREAM_BUFFER_SIZE, receive_many
+from mcup.shared.message import SessionMessage, dump_message_json, parse_message_json
 from ..session import ClientSession
-from ..mcup_session import MCUPSession
+from ..mcup_session import ApprovalFnT, MCUPSession
+
+# Only import the helpers for the platform we're running on
+if sys.platform == "win32":
+    from mcup.os.win32.utilities import (
+        FallbackProcess,
+        create_windows_process,
+        get_windows_executable_command,
+        terminate_windows_process_tree,
+    )
+else:
+    from mcup.os.posix.utilities import terminate_posix_process_tree
+
+    if TYPE_CHECKING:
+        from mcup.os.win32.utilities import FallbackProcess
 
 logger = logging.getLogger(__name__)
 
@@ -51,11 +60,12 @@ DEFAULT_INHERITED_ENV_VARS = (
 # Timeout for process termination before falling back to force kill
 PROCESS_TERMINATION_TIMEOUT = 2.0
 
-def get_default_environment() -> dict[str, str]:
-    """
-    Returns a default environment object including only environment variables deemed
-    safe to inherit.
-    """
+# Frame terminator for newline-delimited JSON-RPC
+_NEWLINE = b"\n"
+
+@functools.cache
+def _cached_default_env() -> dict[str, str]:
+    """Return the filtered inherited environment, computed once on first use. Callers must not mutate it."""
     env: dict[str, str] = {}
     for key in DEFAULT_INHERITED_ENV_VARS:
         value = os.environ.get(key)
@@ -66,6 +76,17 @@ def get_default_environment() -> dict[str, str]:
         env[key] = value
     return env
 
+def get_default_environment() -> dict[str, str]:
+    """
+    Returns a default environment object including only environment variables deemed
+    safe to inherit.
+
+    The variables are read from os.environ once, on first use, and reused for the life of
+    the process; later changes to PATH, HOME, etc. are not picked up. Each call returns a
+    new copy that the caller may modify.
+    """
+    return _cached_default_env().copy()
+
 class StdioServerParameters(BaseModel):
     command: str
     """The executable to run to start the server."""
@@ -73,8 +94,9 @@ class StdioServerParameters(BaseModel):
     """Command line arguments to pass to the executable."""
     env: dict[str, str] | None = None
     """
-    The environment to use when spawning the process.
-    If not specified, the result of get_default_environment() will be used.
+    The environment to use when spawning the process, layered over get_default_environment().
+    If not specified, the result of get_default_environment() will be used. That default is a
+    snapshot of os.environ taken on first use, so later changes to it are not inherited.
     """
     cwd: str | Path | None = None
     """The working directory to use when spawning the process."""
@@ -88,6 +110,7 @@ async def stdio_client(
     server: StdioServerParameters,
     errlog: TextIO = sys.stderr,
     approval_mode: Optional[str] = None,
+    approval_source: ApprovalFnT | None = None,
 ) -> AsyncGenerator[ClientSession, None]:
     """
     Stdio client transport for MCP.
@@ -96,6 +119,7 @@ async def stdio_client(
         server: Parameters for the stdio server (command, args, env).
         errlog: Stream for stderr output (defaults to sys.stderr).
         approval_mode: Optional mode for approving mutating tool calls ('cli' for CLI prompts, None to disable).
+        approval_source: Optional async callable answering approval prompts (defaults to reading stdin).
 
     Yields:
         ClientSession or MCUPSession instance for interacting with the server.
@@ -105,59 +129,98 @@ async def stdio_client(
     write_stream: MemoryObjectSendStream[SessionMessage]
     write_stream_reader: MemoryObjectReceiveStream[SessionMessage]
 
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(STREAM_BUFFER_SIZE)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(STREAM_BUFFER_SIZE)
+
+    env = _cached_default_env()
+    if server.env:
+        env = {**env, **server.env}
 
     try:
         command = _get_executable_command(server.command)
         process = await _create_platform_compatible_process(
             command=command,
             args=server.args,
-            env=({**get_default_environment(), **server.env} if server.env is not None else get_default_environment()),
+            env=env,
             errlog=errlog,
             cwd=server.cwd,
         )
     except OSError:
-        await read_stream.aclose()
-        await write_stream.aclose()
-        await read_stream_writer.aclose()
-        await write_stream_reader.aclose()
+        # Memory streams close synchronously, so no checkpoint is needed here
+        read_stream.close()
+        write_stream.close()
+        read_stream_writer.close()
+        write_stream_reader.close()
         raise
 
     async def stdout_reader():
-        assert process.stdout, "Opened process is missing stdout"
+        stdout = process.stdout
+        assert stdout, "Opened process is missing stdout"
+        send = read_stream_writer.send
+        # pydantic validates UTF-8 bytes directly, skipping a str round-trip; any other codec
+        # (or a lenient error handler) decodes incrementally first, as newlines may not be b"\n"
+        parse_bytes = (
+            codecs.lookup(server.encoding).name == "utf-8" and server.encoding_error_handler == "strict"
+        )
+
+        async def send_line(line: bytearray | str) -> None:
+            try:
+                message = parse_message_json(line)
+                session_message = SessionMessage(message)
+                await send(session_message)
+            except Exception as exc:
+                await send(exc)
+
         try:
             async with read_stream_writer:
-                buffer = ""
-                async for chunk in TextReceiveStream(
-                    process.stdout,
-                    encoding=server.encoding,
-                    errors=server.encoding_error_handler,
-                ):
-                    lines = (buffer + chunk).split("\n")
-                    buffer = lines.pop()
-                    for line in lines:
-                        try:
-                            message = types.JSONRPCMessage.model_validate_json(line)
-                            session_message = SessionMessage(message)
-                            await read_stream_writer.send(session_message)
-                        except Exception as exc:
-                            await read_stream_writer.send(exc)
+                if parse_bytes:
+                    buffer = bytearray()
+                    async for chunk in stdout:
+                        # Bytes already buffered hold no newline, so only the new chunk needs scanning;
+                        # large frames spanning many chunks are then scanned once instead of per chunk
+                        scan_from = len(buffer)
+                        buffer.extend(chunk)
+                        start = 0
+                        while (end := buffer.find(b"\n", scan_from)) >= 0:
+                            await send_line(buffer[start:end])
+                            start = scan_from = end + 1
+                        del buffer[:start]
+                else:
+                    text_buffer = ""
+                    async for text in TextReceiveStream(
+                        stdout,
+                        encoding=server.encoding,
+                        errors=server.encoding_error_handler,
+                    ):
+                        lines = (text_buffer + text).split("\n")
+                        text_buffer = lines.pop()
+                        for line in lines:
+                            await send_line(line)
         except anyio.ClosedResourceError:
             await anyio.lowlevel.checkpoint()
 
     async def stdin_writer():
-        assert process.stdin, "Opened process is missing stdin"
+        stdin = process.stdin
+        assert stdin, "Opened process is missing stdin"
+        send = stdin.send
+        # JSON-RPC text is valid UTF-8, so the default codec needs no error handler
+        use_default_codec = codecs.lookup(server.encoding).name == "utf-8"
+
+        def encode_frame(message: types.JSONRPCMessage) -> bytes:
+            if use_default_codec:
+                return dump_message_json(message) + _NEWLINE
+            json = message.model_dump_json(by_alias=True, exclude_none=True)
+            return (json + "\n").encode(encoding=server.encoding, errors=server.encoding_error_handler)
+
         try:
             async with write_stream_reader:
-                async for session_message in write_stream_reader:
-                    json = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
-                    await process.stdin.send(
-                        (json + "\n").encode(
-                            encoding=server.encoding,
-                            errors=server.encoding_error_handler,
-                        )
-                    )
+                while True:
+                    # Coalesce messages that are already queued into a single write
+                    try:
+                        session_messages = await receive_many(write_stream_reader)
+                    except anyio.EndOfStream:
+                        break
+                    await send(b"".join(encode_frame(m.message) for m in session_messages))
         except anyio.ClosedResourceError:
             await anyio.lowlevel.checkpoint()
 
@@ -165,12 +228,12 @@ async def stdio_client(
         tg.start_soon(stdout_reader)
         tg.start_soon(stdin_writer)
         try:
-            session_class = MCUPSession if approval_mode == "cli" else ClientSession
-            async with session_class(
-                read_stream,
-                write_stream,
-                approval_mode=approval_mode,
-            ) as session:
+            session = (
+                MCUPSession(read_stream, write_stream, approval_mode=approval_mode, approval_source=approval_source)
+                if approval_mode == "cli"
+                else ClientSession(read_stream, write_stream)
+            )
+            async with session:
                 yield session
         finally:
             if process.stdin:
@@ -178,17 +241,19 @@ async def stdio_client(
                     await process.stdin.aclose()
                 except Exception:
                     pass
-            try:
-                with anyio.fail_after(PROCESS_TERMINATION_TIMEOUT):
-                    await process.wait()
-            except TimeoutError:
-                await _terminate_process_tree(process)
-            except ProcessLookupError:
-                pass
-            await read_stream.aclose()
-            await write_stream.aclose()
-            await read_stream_writer.aclose()
-            await write_stream_reader.aclose()
+            # Only arm the termination timeout if the process hasn't already exited
+            if process.returncode is None:
+                try:
+                    with anyio.fail_after(PROCESS_TERMINATION_TIMEOUT):
+                        await process.wait()
+                except TimeoutError:
+                    await _terminate_process_tree(process)
+                except ProcessLookupError:
+                    pass
+            read_stream.close()
+            write_stream.close()
+            read_stream_writer.close()
+            write_stream_reader.close()
 
 def _get_executable_command(command: str) -> str:
     """Get the correct executable command normalized for the current platform."""
@@ -217,7 +282,7 @@ async def _create_platform_compatible_process(
         )
     return process
 
-async def _terminate_process_tree(process: Process | FallbackProcess, timeout_seconds: float = 2.0) -> None:
+async def _terminate_process_tree(process: "Process | FallbackProcess", timeout_seconds: float = 2.0) -> None:
     """Terminate a process and all its children using platform-specific methods."""
     if sys.platform == "win32":
         await terminate_windows_process_tree(process, timeout_seconds)
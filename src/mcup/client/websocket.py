@@ -1,4 +1,3 @@
-import json
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -8,12 +7,13 @@ import anyio
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from pydantic import ValidationError
 from websockets.asyncio.client import connect as ws_connect
+from websockets.exceptions import ConnectionClosedOK
 from websockets.typing import Subprotocol
 
-import mcup.types as types
-from mcup.shared.message import SessionMessage
+from mcup.shared._stream_utils import STREAM_BUFFER_SIZE
+from mcup.shared.message import SessionMessage, dump_message_json, parse_message_json
 from .session import ClientSession
-from .mcup_session import MCUPSession
+from .mcup_session import ApprovalFnT, MCUPSession
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 async def websocket_client(
     url: str,
     approval_mode: Optional[str] = None,
+    approval_source: ApprovalFnT | None = None,
 ) -> AsyncGenerator[ClientSession, None]:
     """
     WebSocket client transport for MCP, symmetrical to the server version.
@@ -30,6 +31,7 @@ async def websocket_client(
     Args:
         url: The WebSocket endpoint URL (e.g., ws://localhost:8000).
         approval_mode: Optional mode for approving mutating tool calls ('cli' for CLI prompts, None to disable).
+        approval_source: Optional async callable answering approval prompts (defaults to reading stdin).
 
     Yields:
         ClientSession or MCUPSession instance for interacting with the server.
@@ -39,19 +41,24 @@ async def websocket_client(
     write_stream: MemoryObjectSendStream[SessionMessage]
     write_stream_reader: MemoryObjectReceiveStream[SessionMessage]
 
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(STREAM_BUFFER_SIZE)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(STREAM_BUFFER_SIZE)
 
     async with ws_connect(url, subprotocols=[Subprotocol("mcp")]) as ws:
         async def ws_reader():
             """
-            Reads text messages from the WebSocket, parses them as JSON-RPC messages,
+            Reads messages from the WebSocket as raw bytes, parses them as JSON-RPC messages,
             and sends them into read_stream_writer.
             """
             async with read_stream_writer:
-                async for raw_text in ws:
+                while True:
                     try:
-                        message = types.JSONRPCMessage.model_validate_json(raw_text)
+                        # Keep frames as bytes; the validator parses UTF-8 directly
+                        raw_bytes = await ws.recv(decode=False)
+                    except ConnectionClosedOK:
+                        break
+                    try:
+                        message = parse_message_json(raw_bytes)
                         session_message = SessionMessage(message)
                         await read_stream_writer.send(session_message)
                     except ValidationError as exc:
@@ -64,17 +71,17 @@ async def websocket_client(
             """
             async with write_stream_reader:
                 async for session_message in write_stream_reader:
-                    msg_dict = session_message.message.model_dump(by_alias=True, mode="json", exclude_none=True)
-                    await ws.send(json.dumps(msg_dict))
+                    # One message per frame, sent as text since the server reads text
+                    await ws.send(dump_message_json(session_message.message), text=True)
 
         async with anyio.create_task_group() as tg:
             tg.start_soon(ws_reader)
             tg.start_soon(ws_writer)
-            session_class = MCUPSession if approval_mode == "cli" else ClientSession
-            async with session_class(
-                read_stream,
-                write_stream,
-                approval_mode=approval_mode,
-            ) as session:
+            session = (
+                MCUPSession(read_stream, write_stream, approval_mode=approval_mode, approval_source=approval_source)
+                if approval_mode == "cli"
+                else ClientSession(read_stream, write_stream)
+            )
+            async with session:
                 yield session
             tg.cancel_scope.cancel()
\ No newline at end of file
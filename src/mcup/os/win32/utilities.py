@@ -127,6 +127,11 @@ class FallbackProcess:
         """Return the process ID."""
         return self.popen.pid
 
+    @property
+    def returncode(self) -> int | None:
+        """Return the exit code, or None if the process is still running."""
+        return self.popen.poll()
+
 
 # ------------------------
 # Updated function
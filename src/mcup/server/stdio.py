@@ -26,8 +26,7 @@ import anyio
 import anyio.lowlevel
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 
-import mcup.types as types
-from mcup.shared.message import SessionMessage
+from mcup.shared.message import SessionMessage, parse_message_json
 
 
 @asynccontextmanager
@@ -62,7 +61,7 @@ async def stdio_server(
             async with read_stream_writer:
                 async for line in stdin:
                     try:
-                        message = types.JSONRPCMessage.model_validate_json(line)
+                        message = parse_message_json(line)
                     except Exception as exc:
                         await read_stream_writer.send(exc)
                         continue
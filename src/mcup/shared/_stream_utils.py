@@ -0,0 +1,38 @@
+"""Utilities for the anyio memory object streams between transports and sessions."""
+
+from typing import TypeVar
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream
+
+__all__ = ["STREAM_BUFFER_SIZE", "receive_many"]
+
+T = TypeVar("T")
+
+# Messages buffered between the transport tasks and the session, so bursts
+# don't force a task switch per message
+STREAM_BUFFER_SIZE = 64
+
+
+async def receive_many(stream: MemoryObjectReceiveStream[T], max_items: int = 32) -> list[T]:
+    """Wait for the next item, then take whatever else is already queued.
+
+    Args:
+        stream: The stream to read from.
+        max_items: Upper bound on the number of items returned.
+
+    Returns:
+        Between 1 and ``max_items`` items, in the order they were sent.
+
+    Raises:
+        anyio.EndOfStream: If the stream is closed and empty, as with ``receive()``.
+    """
+    items = [await stream.receive()]
+    statistics = stream.statistics()
+    pending = statistics.current_buffer_used + statistics.tasks_waiting_send
+    for _ in range(min(pending, max_items - 1)):
+        try:
+            items.append(stream.receive_nowait())
+        except (anyio.WouldBlock, anyio.EndOfStream):
+            break
+    return items
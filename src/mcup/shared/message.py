@@ -7,8 +7,11 @@ to support transport-specific features like resumability.
 
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
+from typing import Any
 
-from mcup.types import JSONRPCMessage, RequestId
+from pydantic import TypeAdapter
+
+from mcup.types import JSONRPCError, JSONRPCMessage, JSONRPCNotification, JSONRPCRequest, JSONRPCResponse, RequestId
 
 ResumptionToken = str
 
@@ -41,3 +44,27 @@ class SessionMessage:
 
     message: JSONRPCMessage
     metadata: MessageMetadata = None
+
+
+# Built once so every inbound message goes straight to the compiled validator
+_MESSAGE_ADAPTER: TypeAdapter[JSONRPCMessage] = TypeAdapter(JSONRPCMessage)
+
+# One adapter per concrete message class, so serialization skips the union dispatch
+_MESSAGE_ADAPTERS: dict[type[Any], TypeAdapter[Any]] = {
+    message_class: TypeAdapter(message_class)
+    for message_class in (JSONRPCRequest, JSONRPCNotification, JSONRPCResponse, JSONRPCError)
+}
+
+
+def dump_message_json(message: JSONRPCMessage) -> bytes:
+    """Serialize a JSON-RPC message to UTF-8 JSON bytes, as sent on the wire."""
+    root = message.root
+    adapter = _MESSAGE_ADAPTERS.get(type(root))
+    if adapter is None:
+        return message.model_dump_json(by_alias=True, exclude_none=True).encode()
+    return adapter.dump_json(root, by_alias=True, exclude_none=True)
+
+
+def parse_message_json(data: str | bytes | bytearray) -> JSONRPCMessage:
+    """Validate a JSON-RPC message from its wire form; bytes are read as UTF-8 without decoding first."""
+    return _MESSAGE_ADAPTER.validate_json(data)
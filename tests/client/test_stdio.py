@@ -9,7 +9,13 @@ import anyio
 import pytest
 
 from mcup.client.session import ClientSession
-from mcup.client.stdio import StdioServerParameters, _create_platform_compatible_process, stdio_client
+from mcup.client.stdio import (
+    StdioServerParameters,
+    _cached_default_env,
+    _create_platform_compatible_process,
+    get_default_environment,
+    stdio_client,
+)
 from mcup.shared.exceptions import McpError
 from mcup.shared.message import SessionMessage
 from mcup.types import CONNECTION_CLOSED, JSONRPCMessage, JSONRPCRequest, JSONRPCResponse
@@ -65,6 +71,51 @@ async def test_stdio_client():
         assert read_messages[1] == JSONRPCMessage(root=JSONRPCResponse(jsonrpc="2.0", id=2, result={}))
 
 
+@pytest.mark.anyio
+@pytest.mark.parametrize("encoding", ["latin-1", "utf-16-le"])
+async def test_stdio_client_server_encoding(encoding: str):
+    """Check that frames are decoded with the server's encoding, not sniffed as UTF-8."""
+    # "Ã©" is c3 a9 in latin-1, which would also parse as UTF-8 "é"
+    server_script = textwrap.dedent(
+        f"""
+        import json
+        import sys
+
+        sys.stdin.reconfigure(encoding={encoding!r})
+        sys.stdout.reconfigure(encoding={encoding!r})
+        request = json.loads(sys.stdin.readline())
+        result = {{
+            "protocolVersion": request["params"]["protocolVersion"],
+            "capabilities": {{}},
+            "serverInfo": {{"name": "Ã©", "version": "1.0"}},
+        }}
+        # A notification first, so the response is not the first frame on the stream
+        notification = {{"method": "notifications/message", "params": {{"level": "info", "data": "Ã©"}}}}
+        print(json.dumps({{"jsonrpc": "2.0", **notification}}, ensure_ascii=False))
+        print(json.dumps({{"jsonrpc": "2.0", "id": request["id"], "result": result}}, ensure_ascii=False), flush=True)
+        sys.stdin.read()
+        """
+    )
+    server_params = StdioServerParameters(command=sys.executable, args=["-c", server_script], encoding=encoding)
+
+    with anyio.fail_after(10):
+        async with stdio_client(server_params) as session:
+            result = await session.initialize()
+
+    assert result.serverInfo.name == "Ã©"
+
+
+def test_get_default_environment_returns_copy():
+    """Check that callers can modify the default environment without touching the cached one."""
+    cached = dict(_cached_default_env())
+    env = get_default_environment()
+    env["MCUP_TEST_ONLY"] = "1"
+    env.pop("PATH", None)
+
+    assert _cached_default_env() == cached
+    assert get_default_environment() == cached
+
+
 @pytest.mark.anyio
 async def test_stdio_client_bad_path():
     """Check that the connection doesn't hang if process errors."""
@@ -99,6 +150,7 @@ async def test_stdio_client_nonexistent_command():
     assert (
         "nonexistent" in error_message
         or "not found" in error_message.lower()
+        or "no such file or directory" in error_message.lower()  # uvloop omits the path
         or "cannot find the file" in error_message.lower()  # Windows error message
     )
 
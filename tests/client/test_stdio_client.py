@@ -1,59 +1,174 @@
-import asyncio
+import functools
+import importlib
+import sys
+import threading
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anyio
 import pytest
+from mcup.client.mcup_session import MCUPSession
 from mcup.client.stdio import stdio_client
 try:
     from mcup.shared.stdio import StdioServerParameters
 except ImportError:
     from mcup.client.stdio import StdioServerParameters  # Fallback import
 from mcup import types
+from mcup.shared.exceptions import McpError
+from mcup.shared.memory import create_client_server_memory_streams
+
+# The package directory name has a hyphen, so it can't be imported with a plain import statement
+simple_tool_server = importlib.import_module("examples.servers.simple-tool.mcp_simple_tool.server")
+
+# Keep the module on one xdist worker so the shared server session is started only once
+pytestmark = pytest.mark.xdist_group("stdio_client")
+
+# Fixed tool arguments shared by the tests below
+WRITE_ARGS = {"data": "example"}
+
+# Page returned for every fetch, by the local HTTP server and by the in-process stub
+EXAMPLE_PAGE = "<html><head><title>Example Domain</title></head></html>"
+
+class ExamplePageHandler(BaseHTTPRequestHandler):
+    """Serve a fixed page for the fetch tool, so the tests don't depend on the network."""
+
+    def do_GET(self):
+        body = EXAMPLE_PAGE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+async def fetch_example_page(url):
+    """Stand-in for fetch_website, so the in-process server never opens a socket."""
+    return [types.TextContent(type="text", text=EXAMPLE_PAGE)], {"url": url}
+
+@asynccontextmanager
+async def in_process_client(approval_mode=None, approval_source=None):
+    """Run the simple-tool server in this process, connected to an MCUPSession over memory streams."""
+    server = simple_tool_server.create_server(fetch=fetch_example_page)
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        client_read, client_write = client_streams
+        server_read, server_write = server_streams
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lambda: server.run(server_read, server_write, server.create_initialization_options()))
+            try:
+                async with MCUPSession(
+                    client_read,
+                    client_write,
+                    approval_mode=approval_mode,
+                    approval_source=approval_source,
+                ) as session:
+                    yield session
+            finally:
+                tg.cancel_scope.cancel()
+
+@pytest.fixture(scope="module")
+def anyio_backend(event_loop_backend):
+    """Widen the backend scope so the shared session fixture can outlive a single test."""
+    return event_loop_backend
 
-@pytest.fixture(scope="session")
+@pytest.fixture(scope="module")
+def fetch_args():
+    """Serve the fetch target on localhost and provide the fetch tool arguments pointing at it."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ExamplePageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield {"url": f"http://127.0.0.1:{httpd.server_port}/"}
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+@pytest.fixture(scope="module")
 def server_params():
     """Provide Stdio server parameters for all tests."""
     return StdioServerParameters(
-        command="python3",
+        # Reuse the running interpreter: no PATH lookup, and the server sees the same environment
+        command=sys.executable,
         args=["-m", "examples.servers.simple-tool.mcp_simple_tool", "--transport", "stdio"],
         env={"UV_INDEX": ""},
     )
 
-@pytest.mark.asyncio
-async def test_initialize_session(server_params):
+async def approve(prompt: str) -> str:
+    """Answer every approval prompt with 'y' so mutating calls run unattended."""
+    print(prompt)
+    return "y"
+
+@pytest.fixture(scope="module", params=["stdio", "in_process"])
+def client_factory(request, server_params):
+    """Open sessions over a server subprocess (stdio) or a server in this process (protocol only)."""
+    if request.param == "stdio":
+        return functools.partial(stdio_client, server_params)
+    return in_process_client
+
+@pytest.fixture(scope="module")
+async def session(client_factory):
+    """Start the server once per client factory and share the initialized session across the module's tests."""
+    async with client_factory(approval_mode="cli", approval_source=approve) as session:
+        await session.initialize()
+        yield session
+
+@pytest.mark.anyio
+async def test_initialize_session(client_factory):
     """Test session initialization."""
-    async with stdio_client(server_params, approval_mode="cli") as session:
+    async with client_factory(approval_mode="cli") as session:
         await session.initialize()
         assert session is not None, "Session should initialize successfully"
 
-@pytest.mark.asyncio
-async def test_list_tools(server_params):
+@pytest.mark.anyio
+async def test_list_tools(session):
     """Verify list_tools includes fetch and write_data."""
-    async with stdio_client(server_params, approval_mode="cli") as session:
-        tools = await session.list_tools()
-        assert isinstance(tools.tools, list), "list_tools should return a list"
-        assert "fetch" in [t.name for t in tools.tools], "fetch tool should be available"
-        assert "write_data" in [t.name for t in tools.tools], "write_data tool should be available"
-        print("Available tools:", [t.name for t in tools.tools])
-
-@pytest.mark.asyncio
-async def test_fetch_tool(server_params):
+    tools = await session.list_tools()
+    assert isinstance(tools.tools, list), "list_tools should return a list"
+    assert "fetch" in [t.name for t in tools.tools], "fetch tool should be available"
+    assert "write_data" in [t.name for t in tools.tools], "write_data tool should be available"
+    print("Available tools:", [t.name for t in tools.tools])
+
+@pytest.mark.anyio
+async def test_fetch_tool(session, fetch_args):
     """Test the fetch tool (non-mutating, no prompt)."""
-    async with stdio_client(server_params, approval_mode="cli") as session:
-        result = await session.call_tool("fetch", arguments={"url": "https://example.com"})
-        assert result.content, "Tool call should return content"
-        result_unstructured = result.content[0]
-        assert isinstance(result_unstructured, types.TextContent), "Result should be TextContent"
-        assert "Example Domain" in result_unstructured.text, "Fetch result should include website content"
-        assert result.structuredContent == {"url": "https://example.com"}, "Structured result should match"
-        print(f"Tool result (fetch): {result_unstructured.text[:100]}...")
-
-@pytest.mark.asyncio
-async def test_write_data_tool(server_params):
+    result = await session.call_tool("fetch", arguments=fetch_args)
+    assert result.content, "Tool call should return content"
+    result_unstructured = result.content[0]
+    assert isinstance(result_unstructured, types.TextContent), "Result should be TextContent"
+    assert "Example Domain" in result_unstructured.text, "Fetch result should include website content"
+    assert result.structuredContent == fetch_args, "Structured result should match"
+    print(f"Tool result (fetch): {result_unstructured.text[:100]}...")
+
+@pytest.mark.anyio
+async def test_write_data_tool(session):
     """Test the write_data tool (mutating, with CLI prompt)."""
-    async with stdio_client(server_params, approval_mode="cli") as session:
-        # Enter 'y' at the CLI prompt when running
-        result = await session.call_tool("write_data", arguments={"data": "example"})
-        assert result.content, "Tool call should return content"
-        result_unstructured = result.content[0]
-        assert isinstance(result_unstructured, types.TextContent), "Result should be TextContent"
-        assert "Data written" in result_unstructured.text, "Write_data result should include Data written"
-        assert result.structuredContent == {"status": "success", "data": "example"}, "Structured result should match"
-        print(f"Tool result (write_data): {result_unstructured.text}")
\ No newline at end of file
+    result = await session.call_tool("write_data", arguments=WRITE_ARGS)
+    assert result.content, "Tool call should return content"
+    result_unstructured = result.content[0]
+    assert isinstance(result_unstructured, types.TextContent), "Result should be TextContent"
+    assert "Data written" in result_unstructured.text, "Write_data result should include Data written"
+    assert result.structuredContent == {"status": "success", "data": "example"}, "Structured result should match"
+    print(f"Tool result (write_data): {result_unstructured.text}")
+
+@pytest.mark.anyio
+async def test_batch(session, fetch_args):
+    """Send tools/list and both tool calls as one batch (write_data prompts first)."""
+    tools, fetch_result, write_result = await session.batch(
+        [
+            ("tools/list", {}),
+            ("tools/call", {"name": "fetch", "arguments": fetch_args}),
+            ("tools/call", {"name": "write_data", "arguments": WRITE_ARGS}),
+        ]
+    )
+    assert isinstance(tools, types.ListToolsResult), "tools/list should return ListToolsResult"
+    assert {"fetch", "write_data"} <= {t.name for t in tools.tools}, "Both tools should be listed"
+    assert fetch_result.structuredContent == fetch_args, "Structured result should match"
+    assert write_result.structuredContent == {"status": "success", "data": "example"}, "Structured result should match"
+
+@pytest.mark.anyio
+async def test_batch_failed_request(session):
+    """A failed request comes back as its exception without cancelling the rest of the batch."""
+    prompts, tools = await session.batch([("prompts/list", {}), ("tools/list", {})])
+    assert isinstance(prompts, McpError), "prompts/list should fail on a server without prompts"
+    assert isinstance(tools, types.ListToolsResult), "tools/list should still return its result"
@@ -1,6 +1,36 @@
+import importlib.util
+import sys
+from typing import Any
+
 import pytest
 
+# anyio backend (name, options) for each --event-loop choice
+EVENT_LOOP_BACKENDS: dict[str, tuple[str, dict[str, Any]]] = {
+    "asyncio": ("asyncio", {"use_uvloop": False}),
+    "uvloop": ("asyncio", {"use_uvloop": True}),
+}
+
+UVLOOP_AVAILABLE = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--event-loop",
+        choices=sorted(EVENT_LOOP_BACKENDS),
+        default="asyncio",
+        help="Event loop for async tests (default: asyncio; uvloop must be installed to select it)",
+    )
+
+
+@pytest.fixture(scope="session")
+def event_loop_backend(request: pytest.FixtureRequest) -> tuple[str, dict[str, Any]]:
+    """The anyio backend selected with --event-loop, for anyio_backend overrides at any scope."""
+    event_loop: str = request.config.getoption("--event-loop")
+    if event_loop == "uvloop" and not UVLOOP_AVAILABLE:
+        pytest.exit("--event-loop uvloop requires uvloop, which is not installed on this platform")
+    return EVENT_LOOP_BACKENDS[event_loop]
+
 
 @pytest.fixture
-def anyio_backend():
-    return "asyncio"
+def anyio_backend(event_loop_backend: tuple[str, dict[str, Any]]):
+    return event_loop_backend
@@ -0,0 +1,38 @@
+"""Tests for JSON-RPC message serialization and parsing."""
+
+import pytest
+
+from mcup.shared.message import dump_message_json, parse_message_json
+from mcup.types import (
+    ErrorData,
+    JSONRPCError,
+    JSONRPCMessage,
+    JSONRPCNotification,
+    JSONRPCRequest,
+    JSONRPCResponse,
+)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        JSONRPCMessage(JSONRPCRequest(jsonrpc="2.0", id=1, method="tools/list")),
+        JSONRPCMessage(JSONRPCRequest(jsonrpc="2.0", id="abc", method="tools/call", params={"name": "fetch"})),
+        JSONRPCMessage(JSONRPCNotification(jsonrpc="2.0", method="notifications/initialized")),
+        JSONRPCMessage(JSONRPCResponse(jsonrpc="2.0", id=2, result={"tools": []})),
+        JSONRPCMessage(JSONRPCError(jsonrpc="2.0", id=3, error=ErrorData(code=-32600, message="Invalid"))),
+    ],
+)
+def test_dump_message_json_matches_model_dump_json(message: JSONRPCMessage):
+    """Test that the per-class serializers produce the same wire format as the root model."""
+    expected = message.model_dump_json(by_alias=True, exclude_none=True).encode()
+    assert dump_message_json(message) == expected
+
+
+@pytest.mark.parametrize("wire_type", [str, bytes, bytearray])
+def test_parse_message_json_accepts_wire_types(wire_type: type[str | bytes | bytearray]):
+    """Test that text and UTF-8 bytes frames parse to the same message."""
+    message = JSONRPCMessage(JSONRPCRequest(jsonrpc="2.0", id=1, method="tools/call", params={"name": "café"}))
+    json = message.model_dump_json(by_alias=True, exclude_none=True)
+    data = json if wire_type is str else wire_type(json.encode())
+    assert parse_message_json(data) == message
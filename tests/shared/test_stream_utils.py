@@ -0,0 +1,43 @@
+"""Tests for memory object stream utility functions."""
+
+import anyio
+import pytest
+
+from mcup.shared._stream_utils import receive_many
+
+
+@pytest.mark.anyio
+async def test_receive_many_takes_queued_items():
+    """Test that already queued items are returned together, in order."""
+    send_stream, receive_stream = anyio.create_memory_object_stream[int](10)
+    async with send_stream, receive_stream:
+        for i in range(5):
+            send_stream.send_nowait(i)
+
+        assert await receive_many(receive_stream) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.anyio
+async def test_receive_many_respects_max_items():
+    """Test that at most max_items are returned and the rest stay queued."""
+    send_stream, receive_stream = anyio.create_memory_object_stream[int](10)
+    async with send_stream, receive_stream:
+        for i in range(5):
+            send_stream.send_nowait(i)
+
+        assert await receive_many(receive_stream, max_items=2) == [0, 1]
+        assert await receive_many(receive_stream, max_items=2) == [2, 3]
+        assert await receive_many(receive_stream, max_items=2) == [4]
+
+
+@pytest.mark.anyio
+async def test_receive_many_end_of_stream():
+    """Test that a closed, empty stream raises EndOfStream."""
+    send_stream, receive_stream = anyio.create_memory_object_stream[int](10)
+    async with receive_stream:
+        send_stream.send_nowait(1)
+        await send_stream.aclose()
+
+        assert await receive_many(receive_stream) == [1]
+        with pytest.raises(anyio.EndOfStream):
+            await receive_many(receive_stream)
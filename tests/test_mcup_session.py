@@ -1,58 +1,167 @@
-import asyncio
+import math
+import sys
+
+import anyio
 import pytest
-from anyio.streams.memory import MemoryObjectSendStream, MemoryObjectReceiveStream
 from mcup.client.mcup_session import MCUPSession
+from mcup.client.session import ClientSession
+from mcup.shared.message import SessionMessage
 from mcup.types import CallToolResult
-import aioconsole
 
-@pytest.mark.asyncio
-async def test_mcup_session_mutating_tool_approval(monkeypatch):
-    """Test CLI approval for mutating tool calls."""
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+# Keep the module on one xdist worker so its module-scoped event loop is shared by all tests
+pytestmark = pytest.mark.xdist_group("mcup_session")
 
-    async def mock_ainput(prompt):
-        print(prompt)  # Simulate CLI prompt
-        return "y"  # Approve action
+@pytest.fixture(scope="module")
+def anyio_backend(event_loop_backend):
+    """Share one event loop across this module's tests."""
+    return event_loop_backend
 
-    monkeypatch.setattr(aioconsole, "ainput", mock_ainput)
+@pytest.fixture
+async def streams():
+    """Provide session streams with unbounded buffers, so sends in these control-flow tests never wait."""
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[SessionMessage | Exception](math.inf)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[SessionMessage](math.inf)
+    async with read_stream_writer, read_stream, write_stream, write_stream_reader:
+        yield read_stream, write_stream
 
-    session = MCUPSession(read_stream, write_stream, approval_mode="cli")
-    result = await session.call_tool("write_data", {"data": "example"})
-    assert isinstance(result, CallToolResult), "Expected CallToolResult"
+class StubToolCallSession(ClientSession):
+    """ClientSession whose tools/call returns an empty result instead of waiting on a server."""
 
-@pytest.mark.asyncio
-async def test_mcup_session_mutating_tool_denial(monkeypatch):
-    """Test CLI denial for mutating tool calls."""
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    async def call_tool(self, name, arguments=None, read_timeout_seconds=None, progress_callback=None):
+        return CallToolResult(content=[])
+
+class ApprovalOnlySession(MCUPSession, StubToolCallSession):
+    """MCUPSession whose super().call_tool resolves to the stub, so tests exercise only the approval flow."""
+
+@pytest.fixture
+def session_factory(streams):
+    """Build sessions whose approval prompt answers with a fixed reply, injected through approval_source."""
+    read_stream, write_stream = streams
+
+    def make(approval_mode, approval="y", **kwargs):
+        async def approval_source(prompt):
+            print(prompt)  # Simulate CLI prompt
+            return approval
 
-    async def mock_ainput(prompt):
-        print(prompt)  # Simulate CLI prompt
-        return "n"  # Deny action
+        return ApprovalOnlySession(
+            read_stream,
+            write_stream,
+            approval_mode=approval_mode,
+            approval_source=approval_source,
+            **kwargs,
+        )
 
-    monkeypatch.setattr(aioconsole, "ainput", mock_ainput)
+    return make
 
-    session = MCUPSession(read_stream, write_stream, approval_mode="cli")
+@pytest.mark.anyio
+async def test_mcup_session_mutating_tool_approval(session_factory):
+    """Test CLI approval for mutating tool calls."""
+    session = session_factory(approval_mode="cli", approval="y")
+    result = await session.call_tool("write_data", {"data": "example"})
+    assert isinstance(result, CallToolResult), "Expected CallToolResult"
+
+@pytest.mark.anyio
+async def test_mcup_session_mutating_tool_denial(session_factory):
+    """Test CLI denial for mutating tool calls."""
+    session = session_factory(approval_mode="cli", approval="n")
     with pytest.raises(ValueError, match="User denied tool call: write_data"):
         await session.call_tool("write_data", {"data": "example"})
 
-@pytest.mark.asyncio
-async def test_mcup_session_non_mutating_tool_no_prompt():
+@pytest.mark.anyio
+async def test_mcup_session_non_mutating_tool_no_prompt(session_factory):
     """Test non-mutating tool calls bypass approval."""
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
-
-    session = MCUPSession(read_stream, write_stream, approval_mode="cli")
+    # A prompt would be answered "n", so success shows no prompt was shown
+    session = session_factory(approval_mode="cli", approval="n")
     result = await session.call_tool("get_data", {"id": "123"})
     assert isinstance(result, CallToolResult), "Expected CallToolResult"
 
-@pytest.mark.asyncio
-async def test_mcup_session_no_approval_mode():
-    """Test no prompts when approval_mode is None."""
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+@pytest.mark.anyio
+async def test_mcup_session_mutating_tool_mixed_case(session_factory):
+    """Test keywords match tool names regardless of case."""
+    session = session_factory(approval_mode="cli", approval="n", mutating_tool_keywords={"Delete"})
+    with pytest.raises(ValueError, match="User denied tool call: DELETE_file"):
+        await session.call_tool("DELETE_file", {"path": "example.txt"})
 
-    session = MCUPSession(read_stream, write_stream, approval_mode=None)
+@pytest.mark.anyio
+async def test_mcup_session_no_mutating_tool_keywords(session_factory):
+    """Test an empty keyword set treats every tool as non-mutating."""
+    # A prompt would be answered "n", so success shows no prompt was shown
+    session = session_factory(approval_mode="cli", approval="n", mutating_tool_keywords=set())
     result = await session.call_tool("write_data", {"data": "example"})
-    assert isinstance(result, CallToolResult), "Expected CallToolResult"
\ No newline at end of file
+    assert isinstance(result, CallToolResult), "Expected CallToolResult"
+
+@pytest.mark.anyio
+async def test_mcup_session_no_approval_mode(session_factory):
+    """Test no prompts when approval_mode is None."""
+    session = session_factory(approval_mode=None, approval="n")
+    result = await session.call_tool("write_data", {"data": "example"})
+    assert isinstance(result, CallToolResult), "Expected CallToolResult"
+
+@pytest.mark.anyio
+async def test_mcup_session_batch_denial_sends_nothing(session_factory, streams):
+    """Test a denied tool call aborts the batch before any request is sent."""
+    _, write_stream = streams
+    session = session_factory(approval_mode="cli", approval="n")
+    with pytest.raises(ValueError, match="User denied tool call: write_data"):
+        await session.batch([("tools/list", {}), ("tools/call", {"name": "write_data", "arguments": {"data": "x"}})])
+    assert write_stream.statistics().current_buffer_used == 0, "No request should reach the server"
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "call, match",
+    [
+        (("tools/call", {"arguments": {"data": "x"}}), "missing the tool name"),
+        (("sampling/createMessage", {}), "Unsupported method in batch"),
+    ],
+)
+async def test_mcup_session_batch_rejects_invalid_calls(session_factory, streams, call, match):
+    """Test malformed batch entries raise ValueError before any request is sent."""
+    _, write_stream = streams
+    session = session_factory(approval_mode="cli", approval="y")
+    with pytest.raises(ValueError, match=match):
+        await session.batch([("tools/list", {}), call])
+    assert write_stream.statistics().current_buffer_used == 0, "No request should reach the server"
+
+# Answers two concurrent prompts from piped stdin, then reads the next line with the builtin input()
+AINPUT_SCRIPT = """
+import asyncio
+from mcup.client.mcup_session import ainput
+
+async def main():
+    print(await asyncio.gather(ainput("A? "), ainput("B? ")), flush=True)
+
+asyncio.run(main())
+print(input(), flush=True)
+"""
+
+@pytest.mark.anyio
+async def test_ainput_reads_piped_stdin():
+    """Test concurrent prompts are answered in order and leave stdin usable for input()."""
+    output = b""
+    with anyio.fail_after(10):
+        async with await anyio.open_process([sys.executable, "-c", AINPUT_SCRIPT], stderr=None) as process:
+            assert process.stdin and process.stdout
+            await process.stdin.send(b"y\nn\n")
+            while b"]" not in output:
+                output += await process.stdout.receive()
+            # Sent only after both prompts returned, so input() has to wait for it on a blocking stdin
+            await process.stdin.send(b"after\n")
+            async for chunk in process.stdout:
+                output += chunk
+    assert output.decode().splitlines() == ["A? B? ['y', 'n']", "after"]
+
+# Reads a line with the builtin input() first, which buffers the rest of the pipe in sys.stdin
+INPUT_FIRST_SCRIPT = """
+import asyncio
+from mcup.client.mcup_session import ainput
+
+name = input()
+print(repr(asyncio.run(ainput(name + ", ok? "))), flush=True)
+"""
+
+@pytest.mark.anyio
+async def test_ainput_after_input_reads_buffered_stdin():
+    """Test an answer already buffered by an earlier input() call is not lost."""
+    with anyio.fail_after(10):
+        result = await anyio.run_process([sys.executable, "-c", INPUT_FIRST_SCRIPT], input=b"alice\ny\n", stderr=None)
+    assert result.stdout.decode().splitlines() == ["alice, ok? 'y'"]